@@ -1,11 +1,72 @@
+import atexit
+import io
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
-import yaml
+
+__all__ = ['logger', 'setup_logging', 'BufferedFileHandler']
 
 # グローバルロガーインスタンスを初期化します。
 logger = logging.getLogger('aina_ytloop')
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    書き込みをバッファリングするファイルハンドラー。
+    レコードごとにwrite()を発行せず、一定件数ごと、またはWARNING以上のログでまとめてフラッシュします。
+    それ以外のタイミングでの書き出しは force_flush() で行います
+    (setup_loggingでは、ログのキューが空になった時点で呼び出します)。
+    """
+    def __init__(self, filename, mode='a', encoding=None, buffer_size=65536, flush_records=100):
+        self.buffer_size = buffer_size
+        self.flush_records = flush_records
+        self._records_since_flush = 0
+        super().__init__(filename, mode=mode, encoding=encoding)
+
+    def _open(self):
+        """
+        指定サイズのバッファを持つテキストストリームとしてログファイルを開きます。
+        """
+        raw = open(self.baseFilename, self.mode.replace('b', '') + 'b', buffering=0)
+        buffered = io.BufferedWriter(raw, buffer_size=self.buffer_size)
+        return io.TextIOWrapper(buffered, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        self._records_since_flush += 1
+        if record.levelno >= logging.WARNING:
+            # 警告以上のログは即座にディスクへ書き出します。
+            self._records_since_flush = self.flush_records
+        super().emit(record)
+
+    def flush(self):
+        """
+        フラッシュ条件を満たした場合のみストリームをフラッシュします。
+        ハンドラーのクローズ時にはストリーム自体のクローズで残りが書き出されます。
+        """
+        if self._records_since_flush < self.flush_records:
+            return
+        self.force_flush()
+
+    def force_flush(self):
+        """
+        フラッシュ条件にかかわらず、バッファの内容をディスクへ書き出します。
+        """
+        self._records_since_flush = 0
+        super().flush()
+
+class _DrainFlushingQueueListener(logging.handlers.QueueListener):
+    """
+    キューが空になった時点で、バッファリングしているハンドラーをフラッシュするQueueListener。
+    連続して出力されたログはまとめて書き出し、出力が途切れたときには必ずディスクへ書き出します。
+    """
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                if isinstance(handler, BufferedFileHandler):
+                    handler.force_flush()
+
 def setup_logging(settings):
     """
     ロギング設定を初期化します。
@@ -15,8 +76,7 @@ def setup_logging(settings):
 
     log_dir = log_settings.get('log_directory', 'logs')
     # ログディレクトリが存在しない場合は作成します。
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(log_dir, exist_ok=True)
 
     log_file_name_timestamp_format = log_settings.get('log_file_name_timestamp_format', '%Y%m%d_%H%M%S')
     log_filename = datetime.now().strftime(f"app_{log_file_name_timestamp_format}.log")
@@ -30,17 +90,26 @@ def setup_logging(settings):
 
         # フォーマッターを作成します。
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = []
 
         # コンソールハンドラーを設定します。
         if log_settings.get('log_to_console', True):
             c_handler = logging.StreamHandler()
             c_handler.setLevel(log_level)
             c_handler.setFormatter(formatter)
-            logger.addHandler(c_handler)
+            handlers.append(c_handler)
 
         # ファイルハンドラーを設定します。
         if log_settings.get('log_to_file', True):
-            f_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+            f_handler = BufferedFileHandler(log_filepath, encoding='utf-8')
             f_handler.setLevel(log_level)
             f_handler.setFormatter(formatter)
-            logger.addHandler(f_handler)
\ No newline at end of file
+            handlers.append(f_handler)
+
+        # 実際の出力はバックグラウンドのリスナースレッドで行い、呼び出し元がI/Oで待たされないようにします。
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = _DrainFlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # 終了時にキューに残ったログを出力します。
+        atexit.register(listener.stop)
\ No newline at end of file
@@ -1,23 +1,90 @@
+import functools
+import logging
 import time
-import youtube_handler
-from obs_handler import OBSHandler
 from datetime import datetime
 import yaml
 import os
+import pickle
 from logger import logger, setup_logging
 
+# libyamlが利用可能な場合はCローダーを使用し、設定ファイルの解析を高速化します。
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 settings = {}
 
+# スクリプトが置かれているディレクトリ。
+_HERE = os.path.dirname(__file__)
+
+# 有効期限が未設定または不正な場合に使用する日時。終了条件の判定では同一性で比較します。
+_FAR_FUTURE = datetime(2099, 12, 31, 23, 59, 59)
+
+@functools.lru_cache(maxsize=8)
+def format_duration(seconds):
+    """
+    秒数を「X時間Y分Z秒」形式の文字列に変換します。
+    """
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    return f"{h}時間{m}分{s}秒"
+
+def _config_cache_key(config_path):
+    """
+    設定ファイルのキャッシュキー (パス, 更新時刻, サイズ) を返します。
+    """
+    stat = os.stat(config_path)
+    return (os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size)
+
+def _load_config_cache(config_path, cache_path):
+    """
+    設定ファイルのキャッシュを読み込みます。
+    キャッシュが存在しない、古い、または破損している場合はNoneを返します。
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, cached_settings = pickle.load(f)
+        if cached_key == _config_cache_key(config_path):
+            return cached_settings
+    except Exception:
+        # キャッシュの読み込みに失敗した場合は、YAMLの解析にフォールバックします。
+        pass
+    return None
+
+def _save_config_cache(config_path, cache_path, loaded_settings):
+    """
+    解析済みの設定をキャッシュファイルに保存します。
+    """
+    try:
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((_config_cache_key(config_path), loaded_settings), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"設定ファイルのキャッシュ保存に失敗しました: {e}")
+
 def load_config():
     """
     設定ファイル (config.yaml) を読み込み、ロギングを設定します。
     """
     global settings
-    config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
+    config_path = os.path.join(_HERE, 'config.yaml')
+    cache_path = config_path + '.pkl'
     try:
+        # 設定ファイルが変更されていなければ、キャッシュからYAMLの解析をスキップして読み込みます。
+        cached_settings = _load_config_cache(config_path, cache_path)
+        if cached_settings is not None:
+            settings.update(cached_settings)
+            setup_logging(settings)
+            logger.info("設定ファイルをキャッシュから読み込みました。")
+            return
+
         with open(config_path, 'r', encoding='utf-8') as f:
-            settings.update(yaml.safe_load(f))
+            settings.update(yaml.load(f, Loader=_YamlLoader))
         setup_logging(settings)
+        _save_config_cache(config_path, cache_path, settings)
         logger.info("設定ファイルを正常に読み込みました。")
     except FileNotFoundError:
         logger.critical(f"設定ファイルが見つかりません: {config_path}。スクリプトを終了します。")
@@ -32,6 +99,11 @@ def main():
     YouTubeライブ配信の自動化フローを管理します。
     """
     load_config()
+
+    # 依存ライブラリの読み込みに時間がかかるため、設定ファイルの読み込み後にインポートします。
+    import youtube_handler
+    from obs_handler import OBSHandler
+
     logger.info("YouTubeライブ自動化スクリプトを開始します。")
 
     # 1. YouTube API認証
@@ -52,23 +124,24 @@ def main():
     loop_duration_hours = settings['loop']['duration_hours']
     expiration_datetime_str = settings['loop']['expiration_datetime']
 
-    expiration_datetime = None
+    expiration_datetime = _FAR_FUTURE
     if expiration_datetime_str:
         try:
             expiration_datetime = datetime.strptime(expiration_datetime_str, "%Y%m%dT%H%M%S")
         except ValueError:
             logger.warning(f"config.yamlのexpiration_datetime形式が不正です: '{expiration_datetime_str}'。デフォルト値 (2099-12-31 23:59:59) を使用します。")
-            expiration_datetime = datetime.max
-    else:
-        expiration_datetime = datetime.max
+            expiration_datetime = _FAR_FUTURE
 
-    start_time = time.time()
+    # 経過時間の計測には、システム時刻の変更の影響を受けない単調時計を使用します。
+    start_time = time.monotonic()
     loop_iteration = 0
-    last_source_reload_time = time.time()
+    last_source_reload_time = time.monotonic()
+    # 前回のループでOBSの配信停止を確認できた場合、ストリーム設定時の状態確認を省略します。
+    obs_stream_stopped = False
 
     try:
         while True:
-            current_time = time.time()
+            current_time = time.monotonic()
             current_datetime = datetime.now()
 
             # 終了条件の確認
@@ -78,11 +151,11 @@ def main():
             if loop_duration_hours != 0 and (current_time - start_time) / 3600 >= loop_duration_hours:
                 logger.info(f"終了条件: 合計配信時間 ({loop_duration_hours}時間) に達しました。")
                 break
-            if expiration_datetime != datetime.max and current_datetime >= expiration_datetime:
+            if expiration_datetime is not _FAR_FUTURE and current_datetime >= expiration_datetime:
                 logger.info(f"終了条件: 有効期限 ({expiration_datetime.strftime('%Y-%m-%d %H:%M:%S')}) に達しました。")
                 break
 
-            logger.info(f"ループ {loop_iteration + 1} / {loop_count if loop_count != 0 else '無限'} を開始します。")
+            logger.info("ループ %d / %s を開始します。", loop_iteration + 1, loop_count if loop_count != 0 else '無限')
 
             try:
                 # 3. YouTubeに新しいライブ配信枠を作成し、ストリームキーを取得
@@ -96,7 +169,9 @@ def main():
 
                 # 4. OBSにストリームキーを設定
                 logger.info("OBSにストリームキーを設定中...")
-                if not obs_handler.set_stream_settings(stream_key):
+                stream_settings_applied = obs_handler.set_stream_settings(stream_key, assume_stopped=obs_stream_stopped)
+                obs_stream_stopped = False
+                if not stream_settings_applied:
                     logger.error("OBSストリームキーの設定に失敗しました。次のループを試行します。")
                     time.sleep(60)
                     continue
@@ -108,32 +183,43 @@ def main():
                 # 6. OBSが実際に配信を開始するまで待機
                 if obs_handler.wait_for_stream_to_start(timeout=settings['script']['obs_stream_start_timeout_seconds']):
                     logger.info("OBSが正常に配信を開始しました。")
-                    
-                    def format_duration(seconds):
-                        h = int(seconds // 3600)
-                        m = int((seconds % 3600) // 60)
-                        s = int(seconds % 60)
-                        return f"{h}時間{m}分{s}秒"
 
-                    duration_str = format_duration(settings['script']['stream_actual_duration_seconds'])
-                    logger.info(f"設定された配信時間 ({duration_str}) 配信を継続します。")
+                    # 配信中に参照する設定値は、ループに入る前に一度だけ取得します。
+                    script_settings = settings['script']
+                    obs_execution_settings = settings.get('obs_execution', {})
+                    stream_duration = script_settings['stream_actual_duration_seconds']
+                    reload_enabled = obs_execution_settings.get('enable_source_reload', False)
+                    reload_interval = obs_execution_settings.get('source_reload_interval_seconds', 300)
+                    source_names = obs_execution_settings.get('source_names', []) or ()
+                    if reload_enabled and reload_interval <= 0:
+                        logger.warning("source_reload_interval_seconds (%s) が0以下のため、ソースの定期的な再読み込みを無効にします。", reload_interval)
+                        reload_enabled = False
+
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("設定された配信時間 (%s) 配信を継続します。", format_duration(stream_duration))
 
                     # 配信中の定期処理
-                    stream_start_time = time.time()
-                    while (time.time() - stream_start_time) < settings['script']['stream_actual_duration_seconds']:
-                        if settings['obs_execution'].get('enable_source_reload', False):
-                            reload_interval = settings['obs_execution'].get('source_reload_interval_seconds', 300)
-                            if (time.time() - last_source_reload_time) >= reload_interval:
-                                logger.info(f"ソースの定期的な再読み込みを実行中 ({reload_interval}秒ごと)...")
-                                for source_name in settings['obs_execution'].get('source_names', []):
-                                    obs_handler.reload_source(source_name)
-                                last_source_reload_time = time.time()
-                        
-                        time.sleep(settings['obs_execution']['stream_status_polling_interval_seconds'])
+                    # 配信終了時刻または次回のソース再読み込み時刻のうち、早い方まで待機します。
+                    stream_start_time = time.monotonic()
+                    stream_end_time = stream_start_time + stream_duration
+                    next_reload_time = last_source_reload_time + reload_interval if reload_enabled else float('inf')
+                    while True:
+                        now = time.monotonic()
+                        if now >= stream_end_time:
+                            break
+                        if now >= next_reload_time:
+                            logger.info("ソースの定期的な再読み込みを実行中 (%s秒ごと)...", reload_interval)
+                            obs_handler.reload_sources(source_names)
+                            last_source_reload_time = time.monotonic()
+                            next_reload_time = last_source_reload_time + reload_interval
+                            continue
+
+                        time.sleep(min(stream_end_time, next_reload_time) - now)
 
                     logger.info("OBSに配信停止コマンドを送信中...")
                     obs_handler.stop_stream()
                     logger.info("OBS配信停止コマンドを正常に送信しました。")
+                    obs_stream_stopped = obs_handler.wait_for_stream_to_stop() is True
                 else:
                     logger.warning("OBSが指定時間内に配信を開始しませんでした。次のループを試行します。")
                     time.sleep(60)
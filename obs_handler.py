@@ -1,7 +1,8 @@
-import obsws_python as obs
-import subprocess
+import json
+import random
+import threading
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 from logger import logger
 
 def ensure_connection(func):
@@ -20,7 +21,16 @@ def ensure_connection(func):
         try:
             return func(self, *args, **kwargs)
         except (ConnectionRefusedError, BrokenPipeError) as e:
-            logger.warning(f"OBSリクエスト中に接続エラーが発生しました ({type(e).__name__})。再接続を試みます...")
+            logger.warning(f"OBSリクエスト中に接続エラーが発生しました ({type(e).__name__})。接続状態を確認します...")
+            if self.is_alive():
+                # 接続自体は生きているため、再接続せずにリクエストを再試行します。
+                logger.info("OBSとの接続は維持されています。再接続せずにリクエストを再試行します。")
+                try:
+                    return func(self, *args, **kwargs)
+                except Exception as e_retry:
+                    logger.error(f"再試行後も '{func.__name__}' の実行に失敗しました: {e_retry}", exc_info=True)
+                    return None
+            logger.warning("OBSとの接続が切れています。再接続を試みます...")
             self.disconnect() # 古い接続を閉じる
             if self.connect():
                 logger.info("OBSへの再接続に成功しました。リクエストを再試行します。")
@@ -37,11 +47,86 @@ def ensure_connection(func):
             return None
     return wrapper
 
+# 出力の状態を表すOBS WebSocketのリクエストエラー (OutputRunning, OutputNotRunning, OutputPaused, OutputNotPaused, OutputDisabled)。
+# 状態が変わらない限り何度送っても同じ結果になるため、リトライしません。
+_OUTPUT_STATE_ERROR_CODES = frozenset(range(500, 505))
+
+def _is_output_state_error(exception):
+    """
+    出力の状態によって失敗したOBSへのリクエストのエラーかどうかを返します。
+    """
+    return (isinstance(exception, _obs_module().error.OBSSDKRequestError)
+            and getattr(exception, 'code', None) in _OUTPUT_STATE_ERROR_CODES)
+
+def retry(max_attempts=3, initial=0.5, factor=2.0, jitter=0.2):
+    """
+    OBSへのリクエストを指数バックオフ (ジッター付き) でリトライするデコレータ。
+    接続エラーはリトライせずにそのまま送出し、ensure_connectionによる再接続に任せます。
+    出力の状態によるエラー (OutputRunningなど) もリトライせずにそのまま送出します。
+    最大試行回数に達した場合は最後の例外を送出します。max_attemptsが1未満の場合も1回は実行します。
+    """
+    max_attempts = max(1, max_attempts)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            delay = initial
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except (ConnectionRefusedError, BrokenPipeError):
+                    raise
+                except Exception as e:
+                    if attempt >= max_attempts or _is_output_state_error(e):
+                        raise
+                    wait = delay * (1 + random.uniform(-jitter, jitter))
+                    logger.warning(f"'{func.__name__}' の実行に失敗しました ({e})。{wait:.1f}秒後にリトライします ({attempt}/{max_attempts})。")
+                    time.sleep(wait)
+                    delay *= factor
+        return wrapper
+    return decorator
+
+# StreamStateChangedイベントのoutputStateと、配信出力の状態 (True: 配信中, False: 停止) の対応。
+# 含まれない状態 (開始処理中・停止処理中・再接続中など) は不明 (None) として扱います。
+_OUTPUT_STATE_ACTIVE = {
+    'OBS_WEBSOCKET_OUTPUT_STARTED': True,
+    'OBS_WEBSOCKET_OUTPUT_RECONNECTED': True,
+    'OBS_WEBSOCKET_OUTPUT_STOPPED': False,
+}
+
+@lru_cache(maxsize=None)
+def _obs_module():
+    """
+    obsws_pythonモジュールを返します。
+    読み込みに時間がかかるため、実際にOBSへ接続するときに初めてインポートします。
+    """
+    import obsws_python
+    return obsws_python
+
+def _backoff(initial=0.025, cap=1.0, factor=2.0):
+    """
+    指数的に増加する待機時間 (秒) を上限に達するまで順に返すジェネレータ。
+    状態変化が速い場合にすぐ検知しつつ、遅い場合にOBSへ問い合わせが集中しないようにします。
+    """
+    delay = initial
+    while True:
+        yield min(delay, cap)
+        delay = min(cap, delay * factor)
+
 class OBSHandler:
     """
     OBS Studioとの連携を管理するクラス。
     OBS WebSocketプロトコルを使用してOBSを制御します。
     """
+    __slots__ = (
+        'settings',
+        'client',
+        'events',
+        '_state_cond',
+        '_output_active',
+        '_current_scene',
+    )
+
     def __init__(self, settings):
         """
         OBSHandlerのコンストラクタ。
@@ -49,6 +134,25 @@ class OBSHandler:
         """
         self.settings = settings
         self.client = None
+        # StreamStateChangedイベントを受信するためのクライアントと、配信状態の変化を通知するイベント
+        self.events = None
+        # 配信出力の状態 (True: 配信中, False: 停止, None: 不明) と、その変化を通知する条件変数
+        self._state_cond = threading.Condition()
+        self._output_active = None
+        # 直近に取得した現在のプログラムシーン名 (取得時刻, シーン名)
+        self._current_scene = (0.0, None)
+
+    def _connection_params(self):
+        """
+        OBS WebSocketクライアントの接続パラメータを返します。
+        """
+        obs_settings = self.settings['obs']
+        return {
+            'host': obs_settings['host'],
+            'port': obs_settings['port'],
+            'password': obs_settings['password'],
+            'timeout': self.settings['obs_execution']['connection_timeout_seconds'],
+        }
 
     def connect(self):
         """
@@ -59,29 +163,35 @@ class OBSHandler:
             logger.debug("OBSクライアントは既に接続されています。")
             return True
 
+        obs = _obs_module()
+        connection_params = self._connection_params()
         try:
             logger.debug("OBSへの接続を試行中...")
-            self.client = obs.ReqClient(
-                host=self.settings['obs']['host'],
-                port=self.settings['obs']['port'],
-                password=self.settings['obs']['password'],
-                timeout=self.settings['obs_execution']['connection_timeout_seconds']
-            )
+            self.client = obs.ReqClient(**connection_params)
             logger.info("OBSに正常に接続しました。")
+            self._connect_events()
             return True
         except ConnectionRefusedError:
             logger.warning("OBSに接続できませんでした。OBSを起動して再接続を試行します...")
             try:
+                import subprocess
+                launch_wait_seconds = self.settings['obs_execution']['launch_wait_seconds']
                 subprocess.Popen(['open', self.settings['obs']['app_path']])
-                logger.info(f"OBSの起動を{self.settings['obs_execution']['launch_wait_seconds']}秒間待機します。")
-                time.sleep(self.settings['obs_execution']['launch_wait_seconds'])
-                self.client = obs.ReqClient(
-                    host=self.settings['obs']['host'],
-                    port=self.settings['obs']['port'],
-                    password=self.settings['obs']['password'],
-                    timeout=self.settings['obs_execution']['connection_timeout_seconds']
-                )
+                logger.info(f"OBSの起動を最大{launch_wait_seconds}秒間待機します。")
+                # 固定時間待機せず、OBSが接続を受け付けるまで短い間隔で接続を試行します。
+                deadline = time.monotonic() + launch_wait_seconds
+                delay = 0.25
+                while True:
+                    try:
+                        self.client = obs.ReqClient(**connection_params)
+                        break
+                    except OSError:
+                        if time.monotonic() + delay >= deadline:
+                            raise
+                        time.sleep(delay)
+                        delay = min(2.0, delay * 1.5)
                 logger.info("OBSに再接続しました。")
+                self._connect_events()
                 return True
             except Exception as e:
                 logger.error(f"OBSの起動または再接続中にエラーが発生しました: {e}", exc_info=True)
@@ -92,10 +202,118 @@ class OBSHandler:
             self.client = None
             return False
 
+    def _connect_events(self):
+        """
+        OBSのイベント通知用クライアントに接続し、StreamStateChangedイベントを購読します。
+        接続に失敗した場合や設定で無効化されている場合は、ポーリングで配信状態を確認します。
+        """
+        if self.events or not self.settings['obs_execution'].get('use_stream_state_events', True):
+            return
+        try:
+            self.events = _obs_module().EventClient(**self._connection_params())
+            self.events.callback.register([self.on_stream_state_changed, self.on_current_program_scene_changed])
+            logger.debug("OBSのStreamStateChanged/CurrentProgramSceneChangedイベントを購読しました。")
+        except Exception as e:
+            logger.warning(f"OBSのイベント購読に失敗しました。ポーリングで配信状態を確認します: {e}")
+            self.events = None
+
+    def on_stream_state_changed(self, data):
+        """
+        OBSのStreamStateChangedイベントを受け取り、配信状態の変化を通知します。
+        outputActiveは停止処理中 (OBS_WEBSOCKET_OUTPUT_STOPPING) でもfalseになるため、
+        outputStateで開始・停止の完了を判定し、それ以外の途中の状態は不明として扱います。
+        """
+        with self._state_cond:
+            self._output_active = _OUTPUT_STATE_ACTIVE.get(data.output_state)
+            self._state_cond.notify_all()
+
+    def on_current_program_scene_changed(self, data):
+        """
+        OBSのCurrentProgramSceneChangedイベントを受け取り、キャッシュしている現在のシーン名を更新します。
+        """
+        self._current_scene = (time.monotonic(), data.scene_name)
+
+    def _get_cached_current_scene(self, ttl=2.0):
+        """
+        キャッシュしている現在のシーン名を返します。
+        イベントを購読していない場合は、取得からttl秒を過ぎたキャッシュは無効とみなしNoneを返します。
+        """
+        cached_at, scene_name = self._current_scene
+        if scene_name is not None and (self.events or time.monotonic() - cached_at < ttl):
+            return scene_name
+        return None
+
+    def _reset_output_state(self):
+        """
+        配信開始・停止コマンドの送信前に、配信出力の状態を不明に戻します。
+        """
+        with self._state_cond:
+            self._output_active = None
+
+    def _wait_for_output_state(self, active, timeout):
+        """
+        StreamStateChangedイベントで配信出力の状態がactiveになるまで、最大timeout秒待機します。
+        """
+        with self._state_cond:
+            return self._state_cond.wait_for(lambda: self._output_active is active, timeout=timeout)
+
+    def is_alive(self):
+        """
+        OBSとの接続が有効かどうかを、最も軽量なリクエスト (GetVersion) で確認します。
+        """
+        if not self.client:
+            return False
+        try:
+            self.client.get_version()
+            return True
+        except Exception:
+            return False
+
+    def _send_batch(self, requests, halt_on_failure=True):
+        """
+        複数のリクエストをOBS WebSocketのRequestBatchとして1回の往復で送信します。
+        requestsは (requestType, requestData) のタプルのリストで、各リクエストの応答データ (dict) を順に返します。
+        halt_on_failure=Trueの場合、いずれかのリクエストが失敗した時点で処理を中断して例外を送出します。
+        Falseの場合は残りのリクエストも実行し、失敗したリクエストの応答データはNoneとして返します。
+        """
+        payload = {
+            'op': 8, # RequestBatch
+            'd': {
+                'requestId': f"batch-{time.monotonic_ns()}",
+                'haltOnFailure': halt_on_failure,
+                'requests': [
+                    {'requestType': request_type, 'requestData': request_data or {}}
+                    for request_type, request_data in requests
+                ],
+            },
+        }
+        ws = self.client.base_client.ws
+        ws.send(json.dumps(payload))
+        response = json.loads(ws.recv())
+        responses = []
+        for result in response['d']['results']:
+            status = result['requestStatus']
+            if status['result']:
+                responses.append(result.get('responseData', {}))
+            elif halt_on_failure:
+                raise _obs_module().error.OBSSDKRequestError(result['requestType'], status['code'], status.get('comment'))
+            else:
+                logger.warning(f"OBSリクエスト '{result['requestType']}' が失敗しました (コード: {status['code']}): {status.get('comment')}")
+                responses.append(None)
+        return responses
+
     def disconnect(self):
         """
         OBSとの接続を解除します。
         """
+        if self.events:
+            try:
+                self.events.disconnect()
+            except Exception as e:
+                logger.error(f"OBSイベントクライアントの切断中にエラーが発生しました: {e}", exc_info=True)
+            finally:
+                self.events = None
+                self._current_scene = (0.0, None)
         if self.client:
             try:
                 self.client.disconnect()
@@ -106,83 +324,123 @@ class OBSHandler:
                 self.client = None
 
     @ensure_connection
-    def set_stream_settings(self, stream_key):
+    def set_stream_settings(self, stream_key, assume_stopped=False):
         """
         OBSのストリーム設定（RTMPサーバーとストリームキー）を設定します。
         もしOBSが配信中の場合、安全のために既存の配信を停止してから設定を試みます。
+        呼び出し元が配信の停止を確認済みの場合は、assume_stopped=Trueで状態確認を省略できます。
         """
-        try:
-            # 現在のストリーム状態を確認
-            status = self.client.get_stream_status()
-            if status and status.output_active:
-                logger.warning("OBSは現在配信中です。前回のストリームが残っている可能性があるため、強制的に停止します。")
-                self.stop_stream()
-                
-                # 配信が停止するのを待機 (タイムアウト付き)
-                stop_wait_start_time = time.time()
-                while time.time() - stop_wait_start_time < 30: # 最大30秒待機
-                    status = self.client.get_stream_status()
-                    if not (status and status.output_active):
+        if not assume_stopped:
+            try:
+                # 現在のストリーム状態を確認
+                status = self.client.get_stream_status()
+                if status and status.output_active:
+                    logger.warning("OBSは現在配信中です。前回のストリームが残っている可能性があるため、強制的に停止します。")
+                    self.stop_stream()
+
+                    # 配信が停止するのを待機 (タイムアウト付き)
+                    if self.wait_for_stream_to_stop(timeout=30):
                         logger.info("残っていたOBSストリームを正常に停止しました。")
-                        break
-                    time.sleep(1)
-                else:
-                    logger.error("残っていたストリームの停止に失敗しました。設定を続行できません。")
-                    return False
+                    else:
+                        logger.error("残っていたストリームの停止に失敗しました。設定を続行できません。")
+                        return False
 
-        except Exception as e:
-            logger.error(f"ストリーム状態の確認中にエラーが発生しました: {e}", exc_info=True)
-            return False
+            except Exception as e:
+                logger.error(f"ストリーム状態の確認中にエラーが発生しました: {e}", exc_info=True)
+                return False
 
         # ストリーム設定の適用（リトライ処理込み）
-        for attempt in range(self.settings['obs_execution']['set_stream_settings_max_retries']):
-            try:
-                logger.debug(f"OBSにストリーム設定をセット中... (試行 {attempt + 1}/{self.settings['obs_execution']['set_stream_settings_max_retries']}, キー: ...{stream_key[-4:]})")
-                self.client.set_stream_service_settings(
-                    ss_type='rtmp_custom',
-                    ss_settings={
-                        'server': self.settings['youtube']['rtmp_url'],
-                        'key': stream_key,
-                        'service': 'YouTube / YouTube Gaming'
-                    }
-                )
-                logger.info("OBSのストリーム設定を正常に更新しました。")
-                return True
-            except Exception as e:
-                # 配信中に設定しようとした場合のエラーをここで捕捉してリトライ
-                logger.error(f"OBSのストリーム設定中にエラーが発生しました: {e}", exc_info=True)
-                if attempt < self.settings['obs_execution']['set_stream_settings_max_retries'] - 1:
-                    logger.warning(f"ストリーム設定のリトライを行います ({self.settings['obs_execution']['set_stream_settings_retry_delay_seconds']}秒後)。")
-                    time.sleep(self.settings['obs_execution']['set_stream_settings_retry_delay_seconds'])
-                else:
-                    logger.critical("ストリーム設定の最大リトライ回数に達しました。設定に失敗しました。")
-                    return False
-        return False
+        max_retries = self.settings['obs_execution']['set_stream_settings_max_retries']
+        retry_delay = self.settings['obs_execution']['set_stream_settings_retry_delay_seconds']
+        stream_service_settings = {
+            'server': self.settings['youtube']['rtmp_url'],
+            'key': stream_key,
+            'service': 'YouTube / YouTube Gaming'
+        }
+        # 配信中に設定しようとした場合のエラーなどは、設定された間隔でリトライします。
+        set_stream_service_settings = retry(max_attempts=max_retries, initial=retry_delay, factor=1.0)(self.client.set_stream_service_settings)
+        try:
+            logger.debug(f"OBSにストリーム設定をセット中... (最大試行回数 {max_retries}, キー: ...{stream_key[-4:]})")
+            set_stream_service_settings(ss_type='rtmp_custom', ss_settings=stream_service_settings)
+        except (ConnectionRefusedError, BrokenPipeError):
+            raise
+        except Exception as e:
+            logger.error(f"OBSのストリーム設定中にエラーが発生しました: {e}", exc_info=True)
+            logger.critical("ストリーム設定の最大リトライ回数に達しました。設定に失敗しました。")
+            return False
+        logger.info("OBSのストリーム設定を正常に更新しました。")
+        return True
 
     @ensure_connection
+    @retry()
     def start_stream(self):
         """
         OBSで配信を開始します。
         """
+        self._reset_output_state()
         self.client.start_stream()
         logger.info("OBS: 配信開始コマンドを送信しました。")
 
     @ensure_connection
+    @retry()
     def stop_stream(self):
         """
         OBSで配信を停止します。
         """
+        self._reset_output_state()
         self.client.stop_stream()
         logger.info("OBS: 配信停止コマンドを送信しました。")
 
+    @ensure_connection
+    def wait_for_stream_to_stop(self, timeout=30):
+        """
+        OBSが実際にストリームを停止するまで待機します。
+        """
+        if self.events:
+            if self._wait_for_output_state(False, timeout):
+                return True
+            # イベントを取りこぼした場合に備えて、最後に状態を確認します。
+            status = self.client.get_stream_status()
+            return not (status and status.output_active)
+
+        delays = _backoff(cap=1.0)
+        stop_wait_start_time = time.monotonic()
+        while time.monotonic() - stop_wait_start_time < timeout:
+            status = self.client.get_stream_status()
+            if not (status and status.output_active):
+                return True
+            time.sleep(next(delays))
+        return False
+
     @ensure_connection
     def wait_for_stream_to_start(self, timeout=30):
         """
         OBSが実際にストリームを開始するまで待機します。
         """
         logger.info(f"OBSがストリームを開始するのを最大{timeout}秒間待機します。")
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        obs_execution_settings = self.settings['obs_execution']
+        if self.events:
+            # イベント通知を待ちつつ、通知の取りこぼしに備えて一定間隔で状態を確認します。
+            watchdog_interval = obs_execution_settings.get('stream_state_watchdog_seconds', 5)
+            deadline = time.monotonic() + timeout
+            while True:
+                status = self.client.get_stream_status()
+                if status and status.output_active:
+                    logger.info("OBSがストリームを正常に開始しました。")
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._wait_for_output_state(True, min(remaining, watchdog_interval)):
+                    logger.info("OBSがストリームを正常に開始しました。")
+                    return True
+            logger.warning(f"{timeout}秒以内にOBSがストリームを開始しませんでした。")
+            return False
+
+        polling_interval = obs_execution_settings['stream_status_polling_interval_seconds']
+        delays = _backoff(cap=polling_interval)
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < timeout:
             try:
                 status = self.client.get_stream_status()
                 if status and status.output_active:
@@ -192,40 +450,142 @@ class OBSHandler:
                 logger.error(f"ストリームステータスの取得中にエラーが発生しました: {e}", exc_info=True)
                 # 接続エラーの可能性があるため、デコレータに処理を任せるために再raiseする
                 raise
-            time.sleep(self.settings['obs_execution']['stream_status_polling_interval_seconds'])
+            time.sleep(next(delays))
         logger.warning(f"{timeout}秒以内にOBSがストリームを開始しませんでした。")
         return False
 
+    def _browser_source_reload_request(self, source_name, current_settings):
+        """
+        ブラウザソースをキャッシュを使わずに再読み込みするリクエストを返します。
+        """
+        return ('PressInputPropertiesButton', {'inputName': source_name, 'propertyName': 'refreshnocache'}), "ブラウザソース"
+
+    def _media_source_reload_request(self, source_name, current_settings):
+        """
+        メディアソースのファイルパスを再設定して再読み込みするリクエストを返します。
+        """
+        file_path = current_settings['local_file']
+        return ('SetInputSettings', {'inputName': source_name, 'inputSettings': {'local_file': file_path}, 'overlay': True}), "メディアソース"
+
+    def _generic_source_reload_request(self, source_name, current_settings):
+        """
+        ブラウザソースでもメディアソースでもないソースについて、現在の設定を再適用するリクエストを返します。
+        """
+        logger.warning(f"ソース '{source_name}' はブラウザソースでもメディアソースでもないため、一般的な再読み込み方法を試行します。")
+        return ('SetInputSettings', {'inputName': source_name, 'inputSettings': current_settings, 'overlay': True}), "ソース"
+
+    # ソースの種類 (input_kind) ごとの再読み込みリクエスト。該当しない場合は設定内容から判断します。
+    _RELOAD_HANDLERS = {
+        'browser_source': _browser_source_reload_request,
+    }
+
+    def _reload_request(self, source_name, input_response):
+        """
+        GetInputSettingsの応答から、ソースの種類に応じた再読み込みリクエストとソースの種類名を返します。
+        """
+        current_settings = input_response['inputSettings']
+        handler = self._RELOAD_HANDLERS.get(input_response['inputKind'])
+        if handler is None:
+            handler = OBSHandler._media_source_reload_request if "local_file" in current_settings else OBSHandler._generic_source_reload_request
+        return handler(self, source_name, current_settings)
+
+    def _fetch_scene_and_input_settings(self, source_names, scene_name):
+        """
+        対象のシーン名と、各ソースのGetInputSettingsの応答 (失敗したソースはNone) を1回の往復で取得します。
+        シーン名が指定されず、キャッシュもない場合は現在のプログラムシーンを同じバッチで取得します。
+        """
+        target_scene = scene_name
+        if target_scene is None:
+            target_scene = self._get_cached_current_scene()
+        requests = [('GetInputSettings', {'inputName': name}) for name in source_names]
+        if target_scene is None:
+            # 現在のシーン名とソース設定の取得は互いに依存しないため、1回の往復でまとめて取得します。
+            scene_response, *input_responses = self._send_batch([('GetCurrentProgramScene', None)] + requests, halt_on_failure=False)
+            if scene_response is None:
+                raise RuntimeError("現在のプログラムシーンの取得に失敗しました。")
+            target_scene = scene_response['currentProgramSceneName']
+            self._current_scene = (time.monotonic(), target_scene)
+            logger.debug(f"シーン名が指定されなかったため、現在アクティブなシーン '{target_scene}' を対象とします。")
+        else:
+            input_responses = self._send_batch(requests, halt_on_failure=False)
+        return target_scene, input_responses
+
+    @retry()
+    def _reload_source_once(self, source_name, scene_name):
+        """
+        指定されたOBSソースを1回再読み込みします。失敗した場合は例外を送出します。
+        """
+        target_scene, (input_response,) = self._fetch_scene_and_input_settings([source_name], scene_name)
+        if input_response is None:
+            raise RuntimeError(f"ソース '{source_name}' の設定を取得できませんでした。")
+
+        logger.info(f"シーン '{target_scene}' 内のソース '{source_name}' の再読み込みを試行中...")
+        (request_type, request_data), source_kind = self._reload_request(source_name, input_response)
+        self.client.send(request_type, request_data)
+        logger.info(f"{source_kind} '{source_name}' (シーン: '{target_scene}') を再読み込みしました。")
+
     @ensure_connection
     def reload_source(self, source_name, scene_name=None):
         """
         指定されたOBSソースを再読み込みします。
         """
         try:
-            target_scene = scene_name
-            if target_scene is None:
-                current_scene_response = self.client.get_current_program_scene()
-                target_scene = current_scene_response.current_program_scene_name
-                logger.debug(f"シーン名が指定されなかったため、現在アクティブなシーン '{target_scene}' を対象とします。")
-
-            logger.info(f"シーン '{target_scene}' 内のソース '{source_name}' の再読み込みを試行中...")
-            response = self.client.get_input_settings(source_name)
-            current_settings = response.input_settings
-            input_kind = response.input_kind
-
-            if input_kind == "browser_source":
-                self.client.press_input_properties_button(source_name, property_name="refreshnocache")
-                logger.info(f"ブラウザソース '{source_name}' (シーン: '{target_scene}') を再読み込みしました。")
-            elif "local_file" in current_settings:
-                file_path = current_settings['local_file']
-                self.client.set_input_settings(source_name, {"local_file": file_path}, overlay=True)
-                logger.info(f"メディアソース '{source_name}' (シーン: '{target_scene}') を設定再適用により再読み込みしました。")
-            else:
-                logger.warning(f"ソース '{source_name}' (シーン: '{target_scene}') はブラウザソースでもメディアソースでもないため、一般的な再読み込み方法を試行します。")
-                self.client.set_input_settings(source_name, current_settings, overlay=True)
-                logger.info(f"ソース '{source_name}' (シーン: '{target_scene}') を設定再適用により再読み込みしました。")
-
+            self._reload_source_once(source_name, scene_name)
             return True
         except Exception as e:
             logger.error(f"ソース '{source_name}' の再読み込み中に予期せぬエラー: {e}", exc_info=True)
             return False
+
+    def _reload_sources_once(self, source_names, scene_name):
+        """
+        複数のOBSソースを1回ずつまとめて再読み込みし、再読み込みに失敗したソース名のリストを返します。
+        設定の取得と再読み込みは、それぞれ1回のRequestBatchで行います。
+        """
+        target_scene, input_responses = self._fetch_scene_and_input_settings(source_names, scene_name)
+        logger.info(f"シーン '{target_scene}' 内の{len(source_names)}件のソースの再読み込みを試行中...")
+
+        failed = []
+        reload_targets = []
+        reload_requests = []
+        for source_name, input_response in zip(source_names, input_responses):
+            if input_response is None:
+                logger.error(f"ソース '{source_name}' の設定を取得できませんでした。")
+                failed.append(source_name)
+                continue
+            request, source_kind = self._reload_request(source_name, input_response)
+            reload_targets.append((source_name, source_kind))
+            reload_requests.append(request)
+
+        if reload_requests:
+            results = self._send_batch(reload_requests, halt_on_failure=False)
+            for (source_name, source_kind), result in zip(reload_targets, results):
+                if result is None:
+                    logger.error(f"{source_kind} '{source_name}' (シーン: '{target_scene}') の再読み込みに失敗しました。")
+                    failed.append(source_name)
+                else:
+                    logger.info(f"{source_kind} '{source_name}' (シーン: '{target_scene}') を再読み込みしました。")
+        return failed
+
+    @ensure_connection
+    def reload_sources(self, source_names, scene_name=None):
+        """
+        複数のOBSソースをまとめて再読み込みします。
+        失敗したソースだけをreload_sourceと同じ条件でリトライし、全てのソースの再読み込みに成功した場合にTrueを返します。
+        """
+        pending = list(source_names)
+        if not pending:
+            return True
+
+        @retry()
+        def reload_pending():
+            failed = self._reload_sources_once(pending, scene_name)
+            if failed:
+                pending[:] = failed
+                raise RuntimeError(f"{len(failed)}件のソースの再読み込みに失敗しました: {', '.join(failed)}")
+
+        try:
+            reload_pending()
+            return True
+        except Exception as e:
+            logger.error(f"ソースの一括再読み込み中に予期せぬエラー: {e}", exc_info=True)
+            return False
@@ -1,26 +1,176 @@
+import atexit
+import copy
+from concurrent.futures import ThreadPoolExecutor
+import json
 import os
 import pickle
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import random
+import time
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from googleapiclient.errors import HttpError
-from datetime import datetime, timedelta
-import pytz
-import yaml
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from logger import logger
 
 SCOPES = ['https://www.googleapis.com/auth/youtube.force-ssl']
+_UTC = timezone.utc
+_JST = ZoneInfo('Asia/Tokyo')
+# HTTPリクエストのタイムアウト (秒)
+HTTP_TIMEOUT_SECONDS = 30
+# 認証済みサービスのキャッシュ。トークンファイルごとに (サービス, 認証情報) を保持します。
+_SERVICE_CACHE = {}
+# 1回のバッチリクエストにまとめるリクエストの最大数 (YouTube Data APIでは50件までを推奨)
+BATCH_SIZE = 50
+# 複数のバッチリクエストを並行して送信する際の最大同時実行数
+BATCH_CONCURRENCY = 4
+# 一時的なエラー (レート制限やサーバーエラー) に対するリトライ回数
+NUM_RETRIES = 5
+# リトライ対象とするHTTPステータスコード
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# 403でもリトライ対象とするレート制限のエラー理由
+RETRYABLE_RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+def _is_retryable_error(exception):
+    """
+    リトライすることで成功する可能性のある一時的なエラーかどうかを返します。
+    """
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status in RETRYABLE_STATUS_CODES:
+        return True
+    return exception.resp.status == 403 and any(reason in str(exception) for reason in RETRYABLE_RATE_LIMIT_REASONS)
+
+def _retry_delay(attempt):
+    """
+    attempt回目 (0始まり) のリトライまでの待機時間 (秒) を、ジッター付きの指数バックオフで返します。
+    """
+    return min(60, 2 ** attempt) + random.random()
+
+def _new_http(credentials):
+    """
+    認証情報付きの新しいHTTP接続を作成します。
+    """
+    return AuthorizedHttp(credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS))
+
+def _execute_batch_chunk(youtube, chunk, callback, http=None, num_retries=NUM_RETRIES):
+    """
+    BATCH_SIZE件以下のリクエストを1つのバッチリクエストとして送信します。
+    httpを省略した場合はサービスのHTTP接続を使用します。
+    バッチリクエスト全体が一時的なエラー (レート制限、サーバーエラー、タイムアウトなどの通信エラー) で
+    失敗した場合は、指数バックオフで待機した後に最大num_retries回まで送信し直します。
+    """
+    for attempt in range(num_retries + 1):
+        batch = youtube.new_batch_http_request(callback=callback)
+        for request_id, request in chunk:
+            batch.add(request, request_id=request_id)
+        try:
+            batch.execute(http=http)
+            return
+        except Exception as e:
+            if attempt >= num_retries or not (_is_retryable_error(e) or isinstance(e, OSError)):
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning(f"バッチリクエストの送信が一時的なエラーで失敗しました ({e})。{delay:.1f}秒後にリトライします ({attempt + 1}/{num_retries})。")
+            time.sleep(delay)
+
+def _execute_batch(youtube, requests, callback, num_retries=NUM_RETRIES):
+    """
+    (request_id, リクエスト) のリストをBATCH_SIZE件ずつバッチリクエストにまとめて実行します。
+    各リクエストの結果は callback(request_id, response, exception) で通知されます。
+    一時的なエラーで失敗したリクエストは、指数バックオフで待機した後に最大num_retries回まで再送します。
+    バッチリクエスト全体が失敗した場合の再送は _execute_batch_chunk で行います。
+    複数のバッチリクエストに分かれる場合は、最大BATCH_CONCURRENCY件を並行して送信します。
+    そのためcallbackは複数のスレッドから呼び出されることがあります。
+    """
+    pending = list(requests)
+    for attempt in range(num_retries + 1):
+        retry_ids = set()
+
+        def on_result(request_id, response, exception):
+            if exception is not None and attempt < num_retries and _is_retryable_error(exception):
+                retry_ids.add(request_id)
+            else:
+                callback(request_id, response, exception)
+
+        chunks = [pending[start:start + BATCH_SIZE] for start in range(0, len(pending), BATCH_SIZE)]
+        if len(chunks) <= 1:
+            for chunk in chunks:
+                _execute_batch_chunk(youtube, chunk, on_result, num_retries=num_retries)
+        else:
+            # httplib2.Httpはスレッドセーフではないため、並行して送信するバッチごとに専用の接続を使用します。
+            credentials = youtube._http.credentials
+            with ThreadPoolExecutor(max_workers=min(BATCH_CONCURRENCY, len(chunks))) as executor:
+                futures = [
+                    executor.submit(_execute_batch_chunk, youtube, chunk, on_result, _new_http(credentials), num_retries)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
+
+        if not retry_ids:
+            return
+        pending = [(request_id, request) for request_id, request in pending if request_id in retry_ids]
+        delay = _retry_delay(attempt)
+        logger.warning(f"{len(pending)}件のリクエストが一時的なエラーで失敗しました。{delay:.1f}秒後にリトライします ({attempt + 1}/{num_retries})。")
+        time.sleep(delay)
+
+def _iter_pages(resource_fn, **list_kwargs):
+    """
+    resource_fn().list(**list_kwargs) の結果を、次のページを取得しながら1件ずつ返します。
+    呼び出し元がループを抜けた時点で、以降のページは取得しません。
+    """
+    resource = resource_fn()
+    request = resource.list(**list_kwargs)
+    while request is not None:
+        response = request.execute(num_retries=NUM_RETRIES)
+        yield from response.get('items', [])
+        request = resource.list_next(request, response)
+
+def _load_credentials(blob):
+    """
+    トークンファイルの内容から認証情報を復元します。
+    認証情報はJSON形式で保存しますが、以前のバージョンで保存されたpickle形式のファイルも読み込めます。
+    内容が壊れている、またはリフレッシュトークンなどの必須項目が欠けている場合はNoneを返し、再認証させます。
+    """
+    try:
+        # pickle形式のデータは先頭がプロトコル番号を示す 0x80 で始まります。
+        if blob[:1] == b'\x80':
+            logger.info("pickle形式のトークンファイルを読み込みます。次回の保存時にJSON形式へ移行します。")
+            return pickle.loads(blob)
+        return Credentials.from_authorized_user_info(json.loads(blob), SCOPES)
+    except (ValueError, pickle.UnpicklingError, EOFError) as e:
+        logger.warning(f"トークンファイルを読み込めませんでした。新しい認証情報を取得します: {e}")
+        return None
 
 def get_authenticated_service(settings):
     """
     YouTube Data APIの認証サービスを取得します。
     既存の認証情報があればそれを使用し、なければOAuth2.0フローで新規取得します。
+    構築したサービスはキャッシュされ、同じHTTP接続 (httplib2.Http) を使い回します。
+    呼び出し元はリクエストの合間に接続を閉じないでください。
     """
+    token_file = settings['youtube']['token_pickle_file']
+    cached = _SERVICE_CACHE.get(token_file)
+    if cached is not None:
+        service, credentials = cached
+        if credentials.valid:
+            logger.debug("キャッシュ済みのYouTubeサービスを使用します。")
+            return service
+
+    # 読み込みに時間がかかるため、サービスの構築が必要になった時点でインポートします。
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from googleapiclient.discovery import build
+
     credentials = None
-    # token.pickle が存在すれば、保存された認証情報を使用
-    if os.path.exists(settings['youtube']['token_pickle_file']):
-        with open(settings['youtube']['token_pickle_file'], 'rb') as token:
-            credentials = pickle.load(token)
+    original_blob = None
+    # トークンファイルが存在すれば、保存された認証情報を使用
+    if os.path.exists(token_file):
+        with open(token_file, 'rb') as token:
+            original_blob = token.read()
+        credentials = _load_credentials(original_blob)
 
     # 認証情報がない、または期限切れの場合、再認証
     if not credentials or not credentials.valid:
@@ -31,97 +181,330 @@ def get_authenticated_service(settings):
             logger.info("新しい認証情報を取得するため、ブラウザを開きます。")
             flow = InstalledAppFlow.from_client_secrets_file(settings['youtube']['client_secrets_file'], SCOPES)
             credentials = flow.run_local_server(port=0)
-        # 認証情報を保存
-        logger.info("認証情報を保存します。")
-        with open(settings['youtube']['token_pickle_file'], 'wb') as token:
-            pickle.dump(credentials, token)
     else:
         logger.info("既存の認証情報を使用します。")
 
-    return build('youtube', 'v3', credentials=credentials)
+    # 認証情報が変化した場合 (旧形式のpickleからの移行を含む) のみ保存
+    new_blob = credentials.to_json().encode('utf-8')
+    if new_blob != original_blob:
+        logger.info("認証情報を保存します。")
+        tmp_path = token_file + '.tmp'
+        with open(tmp_path, 'wb') as token:
+            token.write(new_blob)
+        os.replace(tmp_path, token_file)
+    else:
+        logger.debug("認証情報に変更がないため、保存をスキップします。")
+
+    # 接続を使い回すため、1つのhttplib2.Httpを認証付きでラップしてサービスに渡します。
+    # ライブラリに同梱されたディスカバリドキュメントを使用し、ネットワークからの取得とファイルキャッシュを省きます。
+    service = build('youtube', 'v3', http=_new_http(credentials), static_discovery=True, cache_discovery=False)
+    _SERVICE_CACHE[token_file] = (service, credentials)
+    return service
+
+# 作成リクエストの本文のひな形。初回使用時に設定から一度だけ組み立てます。
+_body_templates = None
+
+def _prepare_broadcast_template(settings):
+    """
+    配信枠・ストリーム・プレイリストの作成リクエスト本文のひな形を返します。
+    設定から決まる値はここで一度だけ埋め、タイトルや日時など呼び出しごとに変わる値は
+    呼び出し元がひな形をコピーしてから設定します。
+    """
+    global _body_templates
+    if _body_templates is None:
+        yt_settings = settings['youtube']
+        broadcast_settings = yt_settings['broadcast']
+        _body_templates = {
+            'broadcast': {
+                'snippet': {
+                    'title': None,
+                    'description': broadcast_settings['description'],
+                    'scheduledStartTime': None,
+                    'scheduledEndTime': None,
+                    'categoryId': broadcast_settings['category_id'],
+                    'tags': broadcast_settings['tags'],
+                },
+                'status': {
+                    'privacyStatus': broadcast_settings['privacy_status'],
+                    'selfDeclaredMadeForKids': broadcast_settings['made_for_kids'],
+                },
+                'contentDetails': {
+                    'enableAutoStart': broadcast_settings['enable_auto_start'],
+                    'enableAutoStop': broadcast_settings['enable_auto_stop'],
+                    'latencyPreference': broadcast_settings['latency_preference'],
+                    'enableDvr': broadcast_settings['enable_dvr'],
+                    'enableLiveChat': broadcast_settings['enable_live_chat'],
+                    'recordFromStart': broadcast_settings['record_from_start'],
+                    'enableArchive': broadcast_settings['enable_archive'],
+                }
+            },
+            'stream': {
+                "snippet": {
+                    "title": None
+                },
+                "cdn": {
+                    "frameRate": yt_settings['create']['stream_frame_rate'],
+                    "ingestionType": yt_settings['stream']['ingestion_type'],
+                    "resolution": yt_settings['stream']['format']
+                }
+            },
+            'playlist': {
+                'snippet': {
+                    'title': None,
+                    'description': None,
+                    'defaultLanguage': yt_settings['playlist']['default_language']
+                },
+                'status': {
+                    'privacyStatus': yt_settings['playlist']['default_privacy_status']
+                }
+            },
+            # タイトルなどの書式文字列は、呼び出しのたびに設定を辿らずに済むよう format_map を保持します。
+            'format_title': broadcast_settings['title_format'].format_map,
+            'format_stream_title': yt_settings['create']['stream_title_format'].format_map,
+            'format_playlist_description': yt_settings['playlist']['description_format'].format_map,
+            'start_offset': timedelta(seconds=yt_settings['create']['start_time_buffer_seconds']),
+            'end_offset': timedelta(seconds=broadcast_settings['scheduled_duration_seconds']),
+        }
+    return _body_templates
+
+def add_to_playlist_batch(youtube, pairs):
+    """
+    (プレイリストID, 動画ID) のリストを受け取り、プレイリストへの動画追加 (playlistItems.insert) を
+    まとめてバッチリクエストで送信します。
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return
+
+    def on_insert(request_id, response, exception):
+        playlist_id, video_id = pairs[int(request_id)]
+        if exception is not None:
+            logger.error(f"動画 {video_id} のプレイリスト {playlist_id} への追加に失敗しました: {exception}")
+        else:
+            logger.info(f"動画 {video_id} をプレイリスト {playlist_id} に追加しました。")
+
+    requests = [
+        (str(index), youtube.playlistItems().insert(
+            part='snippet',
+            fields='id',
+            body={
+                'snippet': {
+                    'playlistId': playlist_id,
+                    'resourceId': {
+                        'kind': 'youtube#video',
+                        'videoId': video_id
+                    }
+                }
+            }
+        ))
+        for index, (playlist_id, video_id) in enumerate(pairs)
+    ]
+    try:
+        _execute_batch(youtube, requests, on_insert)
+    except Exception as e:
+        logger.error(f"プレイリストへの追加リクエストの送信に失敗しました: {e}", exc_info=True)
+
+class _PlaylistInsertBatcher:
+    """
+    プレイリストへの動画追加 (playlistItems.insert) をためておき、add_to_playlist_batch でまとめて送信します。
+    ためた件数がbatch_sizeに達したとき、またはプロセスの正常終了時 (atexit) に送信します。
+    SIGTERMやクラッシュで終了した場合、送信待ちの追加は失われます。
+    """
+    def __init__(self, batch_size=1):
+        self.batch_size = min(BATCH_SIZE, max(1, batch_size))
+        self._youtube = None
+        self._pending = []
+
+    def enqueue(self, youtube, playlist_id, video_id):
+        """
+        プレイリストへの動画追加を予約します。送信条件を満たした場合は、ためていた分とまとめて送信します。
+        """
+        self._youtube = youtube
+        self._pending.append((playlist_id, video_id))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        予約済みのプレイリストへの動画追加をまとめて送信します。
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        add_to_playlist_batch(self._youtube, pending)
+
+# 初回使用時に設定から作成します。
+_playlist_insert_batcher = None
+
+def _get_playlist_insert_batcher(settings):
+    """
+    プレイリストへの動画追加のバッチャーを返します。未作成の場合は設定から作成し、終了時の送信を登録します。
+    """
+    global _playlist_insert_batcher
+    if _playlist_insert_batcher is None:
+        _playlist_insert_batcher = _PlaylistInsertBatcher(
+            batch_size=settings['youtube']['playlist'].get('insert_batch_size', 1),
+        )
+        atexit.register(_playlist_insert_batcher.flush)
+    return _playlist_insert_batcher
+
+# プレイリストのタイトルとIDの対応表。初回使用時にファイルから読み込みます。
+_playlist_cache = None
+
+def _playlist_cache_path(settings):
+    """
+    プレイリストIDのキャッシュファイルのパスを返します。
+    """
+    return settings['youtube'].get('playlist_cache_file', 'playlist_cache.json')
+
+def _load_playlist_cache(settings):
+    """
+    プレイリストIDのキャッシュを返します。未読み込みの場合はファイルから読み込みます。
+    """
+    global _playlist_cache
+    if _playlist_cache is None:
+        _playlist_cache = {}
+        cache_path = _playlist_cache_path(settings)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    _playlist_cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"プレイリストキャッシュの読み込みに失敗しました: {e}")
+    return _playlist_cache
+
+def _save_playlist_cache(settings):
+    """
+    プレイリストIDのキャッシュをファイルに保存します。
+    """
+    cache_path = _playlist_cache_path(settings)
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_playlist_cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"プレイリストキャッシュの保存に失敗しました: {e}")
+
+def _find_playlist_by_id(youtube, playlist_id):
+    """
+    IDを指定してプレイリストを取得し、存在すればそのIDを、存在しなければNoneを返します。
+    タイトルで全プレイリストを検索するよりも軽量な、1回のリクエストで確認できます。
+    """
+    response = youtube.playlists().list(
+        part='id',
+        fields='items/id',
+        id=playlist_id,
+        maxResults=1
+    ).execute(num_retries=NUM_RETRIES)
+    items = response.get('items', [])
+    return items[0]['id'] if items else None
 
 def get_or_create_playlist(youtube, playlist_title, settings):
     """
     指定されたタイトルのプレイリストを検索し、なければ作成してIDを返します。
     """
-    logger.info(f"プレイリスト '{playlist_title}' を検索中...")
+    playlist_cache = _load_playlist_cache(settings)
     try:
+        # キャッシュにあれば、プレイリストが存在することだけを確認して返します。
+        cached_id = playlist_cache.get(playlist_title)
+        if cached_id:
+            if _find_playlist_by_id(youtube, cached_id):
+                logger.info(f"キャッシュからプレイリスト '{playlist_title}' (ID: {cached_id}) を見つけました。")
+                return cached_id
+            logger.info(f"キャッシュされたプレイリスト '{playlist_title}' (ID: {cached_id}) が見つからないため、再検索します。")
+            del playlist_cache[playlist_title]
+            _save_playlist_cache(settings)
+
+        logger.info(f"プレイリスト '{playlist_title}' を検索中...")
         # 既存のプレイリストを検索
-        next_page_token = None
-        while True:
-            response = youtube.playlists().list(
-                part='id,snippet',
-                mine=True,
-                maxResults=50,
-                pageToken=next_page_token
-            ).execute()
-
-            for item in response.get('items', []):
-                if item['snippet']['title'] == playlist_title:
-                    logger.info(f"既存のプレイリスト '{playlist_title}' (ID: {item['id']}) を見つけました。")
-                    return item['id']
-
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
+        for item in _iter_pages(
+            youtube.playlists,
+            part='snippet',
+            fields='items(id,snippet/title),nextPageToken',
+            mine=True,
+            maxResults=50
+        ):
+            if item['snippet']['title'] == playlist_title:
+                logger.info(f"既存のプレイリスト '{playlist_title}' (ID: {item['id']}) を見つけました。")
+                playlist_cache[playlist_title] = item['id']
+                _save_playlist_cache(settings)
+                return item['id']
 
         # プレイリストが見つからなければ作成
         logger.info(f"プレイリスト '{playlist_title}' が見つかりませんでした。新しく作成します。")
-        playlist_body = {
-            'snippet': {
-                'title': playlist_title,
-                'description': settings['youtube']['playlist']['description_format'].format(playlist_title=playlist_title),
-                'defaultLanguage': settings['youtube']['playlist']['default_language']
-            },
-            'status': {
-                'privacyStatus': settings['youtube']['playlist']['default_privacy_status']
-            }
-        }
+        templates = _prepare_broadcast_template(settings)
+        playlist_body = copy.deepcopy(templates['playlist'])
+        playlist_body['snippet']['title'] = playlist_title
+        playlist_body['snippet']['description'] = templates['format_playlist_description']({'playlist_title': playlist_title})
         response = youtube.playlists().insert(
             part='snippet,status',
+            fields='id',
             body=playlist_body
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         logger.info(f"新しいプレイリスト '{playlist_title}' (ID: {response['id']}) を作成しました。")
+        playlist_cache[playlist_title] = response['id']
+        _save_playlist_cache(settings)
         return response['id']
 
     except Exception as e:
         logger.error(f"プレイリストの検索または作成に失敗しました: {e}", exc_info=True)
         return None
 
+# クリーンアップ対象の一覧を取得する際のパラメータ
+_UPCOMING_BROADCASTS_LIST_PARAMS = {
+    'part': 'id',
+    'broadcastStatus': 'upcoming',
+    'fields': 'items/id,nextPageToken',
+    'maxResults': 50,
+}
+_LIVE_STREAMS_LIST_PARAMS = {
+    'part': 'id',
+    'fields': 'items/id,nextPageToken',
+    'mine': True,
+    'maxResults': 50,
+}
+
+def _on_broadcast_deleted(broadcast_id, response, exception):
+    """
+    配信枠の削除結果をログに出力します。
+    """
+    if exception is not None:
+        logger.error(f"配信枠 {broadcast_id} の削除中にエラーが発生しました: {exception}")
+    else:
+        logger.info(f"配信枠 {broadcast_id} を削除しました。")
+
+def _on_stream_deleted(stream_id, response, exception):
+    """
+    ライブストリームの削除結果をログに出力します。
+    """
+    if exception is None:
+        logger.info(f"ストリーム {stream_id} を削除しました。")
+    elif isinstance(exception, HttpError) and exception.resp.status == 403 and "liveStreamDeletionNotAllowed" in str(exception):
+        logger.warning(f"ストリーム {stream_id} は現在削除できません (Stream deletion is not allowed)。スキップします。")
+    else:
+        logger.error(f"ストリーム {stream_id} の削除中に予期せぬエラーが発生しました: {exception}")
+
+def _on_cleanup_deleted(request_id, response, exception):
+    """
+    _cleanup_delete_requests で作成した削除リクエストの結果をログに出力します。
+    """
+    kind, _, item_id = request_id.partition(':')
+    if kind == 'delete-broadcast':
+        _on_broadcast_deleted(item_id, response, exception)
+    else:
+        _on_stream_deleted(item_id, response, exception)
+
 def delete_all_scheduled_broadcasts(youtube):
     """
     既存の予定されているライブ配信枠を全て削除します。
     """
     logger.info("既存の予定されている配信枠を全て削除します。")
     try:
-        all_broadcast_ids = []
-        next_page_token = None
-        while True:
-            response = youtube.liveBroadcasts().list(
-                part='id',
-                broadcastStatus='upcoming',
-                maxResults=50,
-                pageToken=next_page_token
-            ).execute()
-
-            for item in response.get('items', []):
-                all_broadcast_ids.append(item['id'])
-
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
-
-        if not all_broadcast_ids:
-            logger.info("削除する予定されている配信枠はありませんでした。")
-            return
-
-        logger.info(f"{len(all_broadcast_ids)}件の予定されている配信枠を削除します。")
-        for broadcast_id in all_broadcast_ids:
-            logger.info(f"配信枠 {broadcast_id} を削除中...")
-            youtube.liveBroadcasts().delete(id=broadcast_id).execute()
-            logger.info(f"配信枠 {broadcast_id} を削除しました。")
-        logger.info("全ての予定されている配信枠の削除が完了しました。")
-
+        requests = _cleanup_delete_requests(youtube, kinds=('broadcast',))
+        if requests:
+            _execute_batch(youtube, requests, _on_cleanup_deleted)
+            logger.info("全ての予定されている配信枠の削除が完了しました。")
     except Exception as e:
         logger.error(f"予定されている配信枠の削除中にエラーが発生しました: {e}", exc_info=True)
 
@@ -131,127 +514,248 @@ def delete_all_live_streams(youtube):
     """
     logger.info("既存のライブストリームを全て削除します。")
     try:
-        all_stream_ids = []
-        next_page_token = None
-        while True:
-            response = youtube.liveStreams().list(
-                part='id',
-                mine=True,
-                maxResults=50,
-                pageToken=next_page_token
-            ).execute()
-
-            for item in response.get('items', []):
-                all_stream_ids.append(item['id'])
+        requests = _cleanup_delete_requests(youtube, kinds=('stream',))
+        if requests:
+            _execute_batch(youtube, requests, _on_cleanup_deleted)
+            logger.info("全てのライブストリームの削除が完了しました。")
+    except Exception as e:
+        logger.error(f"ライブストリームの削除中にエラーが発生しました: {e}", exc_info=True)
 
-            next_page_token = response.get('nextPageToken')
-            if not next_page_token:
-                break
+# このスクリプトが作成した配信枠とストリームのID。初回使用時にファイルから読み込みます。
+_created_resources = None
+# 開始前 (broadcastStatus='upcoming' に相当) の配信枠のステータス
+_UPCOMING_LIFE_CYCLE_STATUSES = ('created', 'ready')
 
-        if not all_stream_ids:
-            logger.info("削除するライブストリームはありませんでした。")
-            return
+def _created_resources_path(settings):
+    """
+    作成した配信枠とストリームのIDを記録するファイルのパスを返します。
+    """
+    return settings['youtube'].get('created_resources_file', 'created_resources.json')
 
-        logger.info(f"{len(all_stream_ids)}件のライブストリームを削除します。")
-        for stream_id in all_stream_ids:
-            logger.info(f"ストリーム {stream_id} を削除中...")
+def _load_created_resources(settings):
+    """
+    作成した配信枠とストリームのIDの記録 {'broadcast': [...], 'stream': [...]} を返します。
+    未読み込みの場合はファイルから読み込みます。
+    """
+    global _created_resources
+    if _created_resources is None:
+        _created_resources = {'broadcast': [], 'stream': []}
+        path = _created_resources_path(settings)
+        if os.path.exists(path):
             try:
-                youtube.liveStreams().delete(id=stream_id).execute()
-                logger.info(f"ストリーム {stream_id} を削除しました。")
-            except HttpError as e:
-                if e.resp.status == 403 and "liveStreamDeletionNotAllowed" in str(e):
-                    logger.warning(f"ストリーム {stream_id} は現在削除できません (Stream deletion is not allowed)。スキップします。")
-                else:
-                    logger.error(f"ストリーム {stream_id} の削除中に予期せぬエラーが発生しました: {e}", exc_info=True)
-        logger.info("全てのライブストリームの削除が完了しました。")
+                with open(path, 'r', encoding='utf-8') as f:
+                    _created_resources.update(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"作成済みの配信枠とストリームの記録の読み込みに失敗しました: {e}")
+    return _created_resources
+
+def _save_created_resources(settings):
+    """
+    作成した配信枠とストリームのIDの記録をファイルに保存します。
+    """
+    path = _created_resources_path(settings)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_created_resources, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"作成済みの配信枠とストリームの記録の保存に失敗しました: {e}")
+
+def _created_cleanup_delete_requests(youtube, settings):
+    """
+    このスクリプトが作成した配信枠とストリームのうち、クリーンアップ対象の削除リクエストを作成します。
+    一覧を取得する代わりに記録済みのIDを使用し、配信枠はまだ開始していないものだけを対象にします。
+    開始済みの配信枠は削除するとアーカイブが失われるため、記録から外します。
+    """
+    created = _load_created_resources(settings)
+    requests = []
+
+    # ステータスが 'created' / 'ready' であると確認できた配信枠だけを削除します。
+    # ステータスを取得できなかった場合は、開始済みの配信枠を削除しないよう今回は配信枠の削除を見送り、記録はそのまま残します。
+    upcoming_ids = []
+    broadcast_ids = created['broadcast']
+    if broadcast_ids:
+        statuses = get_live_broadcast_statuses(youtube, broadcast_ids)
+        if statuses is None:
+            logger.warning("配信枠のステータスを取得できなかったため、今回は配信枠の削除をスキップします。")
+        else:
+            upcoming_ids = [
+                broadcast_id for broadcast_id in broadcast_ids
+                if statuses.get(broadcast_id) in _UPCOMING_LIFE_CYCLE_STATUSES
+            ]
+            created['broadcast'] = list(upcoming_ids)
+            _save_created_resources(settings)
+    if upcoming_ids:
+        logger.info(f"{len(upcoming_ids)}件の予定されている配信枠を削除します。")
+        requests.extend(
+            (f"delete-broadcast:{broadcast_id}", youtube.liveBroadcasts().delete(id=broadcast_id))
+            for broadcast_id in upcoming_ids
+        )
+    else:
+        logger.info("削除する予定されている配信枠はありませんでした。")
+
+    if created['stream']:
+        logger.info(f"{len(created['stream'])}件のライブストリームを削除します。")
+        requests.extend(
+            (f"delete-stream:{stream_id}", youtube.liveStreams().delete(id=stream_id))
+            for stream_id in created['stream']
+        )
+    else:
+        logger.info("削除するライブストリームはありませんでした。")
+    return requests
+
+def _cleanup_delete_requests(youtube, kinds=('broadcast', 'stream')):
+    """
+    クリーンアップ対象 (予定されている配信枠と全てのライブストリーム) の削除リクエストを作成します。
+    kindsには対象とする種類 ('broadcast' / 'stream') を指定します。
+    リクエストIDには 'delete-broadcast:<ID>' または 'delete-stream:<ID>' を使用します。
+    一覧は全てのページを取得してから削除リクエストを作成します (削除によってページの位置がずれるのを避けるため)。
+    各一覧の最初のページは1つのバッチリクエストでまとめて取得するため、
+    削除対象がない場合は1回の往復で確認が終わります。
+    一覧の取得に失敗した種類は、エラーをログに出力して対象から外します。
+    """
+    targets = {
+        'broadcast': (youtube.liveBroadcasts(), _UPCOMING_BROADCASTS_LIST_PARAMS, "予定されている配信枠"),
+        'stream': (youtube.liveStreams(), _LIVE_STREAMS_LIST_PARAMS, "ライブストリーム"),
+    }
+    targets = {kind: targets[kind] for kind in kinds}
+    list_requests = {kind: resource.list(**params) for kind, (resource, params, _) in targets.items()}
+    first_pages = {}
 
+    def on_list(kind, response, exception):
+        if exception is not None:
+            logger.error(f"{targets[kind][2]}の取得中にエラーが発生しました: {exception}")
+        else:
+            first_pages[kind] = response
+
+    try:
+        _execute_batch(youtube, list(list_requests.items()), on_list)
     except Exception as e:
-        logger.error(f"ライブストリームの削除中にエラーが発生しました: {e}", exc_info=True)
+        logger.error(f"クリーンアップ対象の取得中にエラーが発生しました: {e}", exc_info=True)
+        return []
+
+    requests = []
+    for kind, response in first_pages.items():
+        resource, _, label = targets[kind]
+        request = list_requests[kind]
+        item_ids = []
+        try:
+            while True:
+                item_ids.extend(item['id'] for item in response.get('items', []))
+                request = resource.list_next(request, response)
+                if request is None:
+                    break
+                response = request.execute(num_retries=NUM_RETRIES)
+        except Exception as e:
+            logger.error(f"{label}の取得中にエラーが発生しました: {e}", exc_info=True)
+            continue
+        if not item_ids:
+            logger.info(f"削除する{label}はありませんでした。")
+            continue
+        logger.info(f"{len(item_ids)}件の{label}を削除します。")
+        requests.extend((f"delete-{kind}:{item_id}", resource.delete(id=item_id)) for item_id in item_ids)
+    return requests
 
 def create_youtube_broadcast(youtube, settings):
     """
     YouTubeに新しいライブ配信枠を作成し、ストリームキーを返します。
     config.yamlの設定を使用します。
     """
-    if settings['youtube']['cleanup_old_broadcasts']:
+    yt_settings = settings['youtube']
+    broadcast_settings = yt_settings['broadcast']
+
+    # 削除対象は新しい配信枠を作成する前に確定させ、削除リクエストは作成リクエストと同じバッチで送信します。
+    # cleanup_created_only が有効な場合は、このスクリプトが作成した配信枠とストリームだけを記録から削除対象にします。
+    # クリーンアップが無効な場合は記録しても削除されず増え続けるため、両方が有効な場合のみ記録します。
+    track_created = yt_settings['cleanup_old_broadcasts'] and yt_settings.get('cleanup_created_only', False)
+    cleanup_requests = []
+    if yt_settings['cleanup_old_broadcasts']:
         logger.info("既存の配信枠とストリームのクリーンアップを開始します。")
-        delete_all_scheduled_broadcasts(youtube)
-        delete_all_live_streams(youtube)
-        logger.info("既存の配信枠とストリームのクリーンアップが完了しました。")
+        if track_created:
+            cleanup_requests = _created_cleanup_delete_requests(youtube, settings)
+        else:
+            cleanup_requests = _cleanup_delete_requests(youtube)
     else:
         logger.info("既存の配信枠とストリームの削除はスキップされました。")
 
-    utc_now = datetime.utcnow().replace(tzinfo=pytz.utc)
-    jst = pytz.timezone('Asia/Tokyo')
-    now_jst = utc_now.astimezone(jst)
+    utc_now = datetime.now(_UTC)
+    now_jst = utc_now.astimezone(_JST)
+
+    templates = _prepare_broadcast_template(settings)
 
     # タイトル生成
     broadcast_count = 1 # 仮の値
-    title = settings['youtube']['broadcast']['title_format'].format(
-        date=now_jst.strftime("%Y-%m-%d"),
-        time=now_jst.strftime("%H:%M:%S"),
-        count=broadcast_count
-    )
-
-    # 1. ライブ配信枠(Broadcast)を作成
-    logger.info("1/4: 新しいライブ配信枠を作成中...")
-    broadcast_body = {
-        'snippet': {
-            'title': title,
-            'description': settings['youtube']['broadcast']['description'],
-            'scheduledStartTime': (utc_now + timedelta(seconds=settings['youtube']['create']['start_time_buffer_seconds'])).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'scheduledEndTime': (utc_now + timedelta(seconds=settings['youtube']['broadcast']['scheduled_duration_seconds'])).strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'categoryId': settings['youtube']['broadcast']['category_id'],
-            'tags': settings['youtube']['broadcast']['tags'],
-        },
-        'status': {
-            'privacyStatus': settings['youtube']['broadcast']['privacy_status'],
-            'selfDeclaredMadeForKids': settings['youtube']['broadcast']['made_for_kids'],
-        },
-        'contentDetails': {
-            'enableAutoStart': settings['youtube']['broadcast']['enable_auto_start'],
-            'enableAutoStop': settings['youtube']['broadcast']['enable_auto_stop'],
-            'latencyPreference': settings['youtube']['broadcast']['latency_preference'],
-            'enableDvr': settings['youtube']['broadcast']['enable_dvr'],
-            'enableLiveChat': settings['youtube']['broadcast']['enable_live_chat'],
-            'recordFromStart': settings['youtube']['broadcast']['record_from_start'],
-            'enableArchive': settings['youtube']['broadcast']['enable_archive'],
-        }
-    }
+    title = templates['format_title']({
+        'date': now_jst.date().isoformat(),
+        'time': now_jst.time().isoformat(timespec='seconds'),
+        'count': broadcast_count,
+    })
+
+    # 1-2. ライブ配信枠(Broadcast)とライブストリーム(Stream)を作成
+    # 両者は互いに依存せず、クリーンアップの削除とも依存しないため、1つのバッチリクエストにまとめて1回の往復で実行します。
+    # 紐付け(Bind)はバッチの完了後に行うため、古いストリームの削除が終わってから実行されます。
+    logger.info("1-2/4: 新しいライブ配信枠とライブストリームを作成中...")
+    broadcast_body = copy.deepcopy(templates['broadcast'])
+    broadcast_body['snippet']['title'] = title
+    broadcast_body['snippet']['scheduledStartTime'] = (utc_now + templates['start_offset']).isoformat(timespec='seconds')
+    broadcast_body['snippet']['scheduledEndTime'] = (utc_now + templates['end_offset']).isoformat(timespec='seconds')
+    stream_body = copy.deepcopy(templates['stream'])
+    stream_body['snippet']['title'] = templates['format_stream_title']({'datetime': utc_now.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')})
+
+    insert_responses = {}
+    insert_errors = {}
+
+    created = _load_created_resources(settings) if track_created else None
+
+    def on_result(request_id, response, exception):
+        kind, _, item_id = request_id.partition(':')
+        if kind in ('delete-broadcast', 'delete-stream'):
+            _on_cleanup_deleted(request_id, response, exception)
+            # 削除済み (または既に存在しない) ものは記録から外します。
+            if created is not None and (exception is None or (isinstance(exception, HttpError) and exception.resp.status == 404)):
+                resource_ids = created[kind[len('delete-'):]]
+                if item_id in resource_ids:
+                    resource_ids.remove(item_id)
+        elif exception is not None:
+            insert_errors[request_id] = exception
+        else:
+            insert_responses[request_id] = response
+
     try:
-        broadcast_insert_response = youtube.liveBroadcasts().insert(
-            part='snippet,status,contentDetails',
-            body=broadcast_body
-        ).execute()
-        broadcast_id = broadcast_insert_response['id']
-        logger.info(f"配信枠を作成しました (ID: {broadcast_id})")
+        _execute_batch(
+            youtube,
+            cleanup_requests + [
+                ('broadcast', youtube.liveBroadcasts().insert(part='snippet,status,contentDetails', fields='id', body=broadcast_body)),
+                ('stream', youtube.liveStreams().insert(part="snippet,cdn", fields='id,cdn/ingestionInfo/streamName', body=stream_body)),
+            ],
+            on_result
+        )
     except Exception as e:
-        logger.error(f"配信枠の作成に失敗しました: {e}", exc_info=True)
+        logger.error(f"配信枠とストリームの作成リクエストに失敗しました: {e}", exc_info=True)
         return None
+    if cleanup_requests:
+        logger.info("既存の配信枠とストリームのクリーンアップが完了しました。")
+    if created is not None:
+        for kind in ('broadcast', 'stream'):
+            if kind in insert_responses:
+                created[kind].append(insert_responses[kind]['id'])
+        _save_created_resources(settings)
+
+    if 'broadcast' in insert_errors:
+        logger.error(f"配信枠の作成に失敗しました: {insert_errors['broadcast']}")
+    else:
+        broadcast_id = insert_responses['broadcast']['id']
+        logger.info(f"配信枠を作成しました (ID: {broadcast_id})")
 
-    # 2. ライブストリーム(Stream)を作成
-    logger.info("2/4: 新しいライブストリームを作成中...")
-    try:
-        stream_body = {
-            "snippet": {
-                "title": settings['youtube']['create']['stream_title_format'].format(datetime=utc_now.strftime('%Y-%m-%d %H:%M:%S'))
-            },
-            "cdn": {
-                "frameRate": settings['youtube']['create']['stream_frame_rate'],
-                "ingestionType": settings['youtube']['stream']['ingestion_type'],
-                "resolution": settings['youtube']['stream']['format']
-            }
-        }
-        stream_insert_response = youtube.liveStreams().insert(
-            part="snippet,cdn",
-            body=stream_body
-        ).execute()
-        stream_id = stream_insert_response['id']
-        stream_name = stream_insert_response['cdn']['ingestionInfo']['streamName']
+    if 'stream' in insert_errors:
+        logger.error(f"ストリームの作成に失敗しました: {insert_errors['stream']}")
+    else:
+        stream_id = insert_responses['stream']['id']
+        stream_name = insert_responses['stream']['cdn']['ingestionInfo']['streamName']
         logger.info(f"新しいストリームを作成しました (ID: {stream_id})")
 
-    except Exception as e:
-        logger.error(f"ストリームの作成に失敗しました: {e}", exc_info=True)
+    if insert_errors:
         return None
 
     # 3. 配信枠とストリームを紐付け(Bind)
@@ -259,36 +763,21 @@ def create_youtube_broadcast(youtube, settings):
     try:
         youtube.liveBroadcasts().bind(
             part='id,snippet,contentDetails',
+            fields='id',
             id=broadcast_id,
             streamId=stream_id
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         logger.info("紐付けに成功しました。")
     except Exception as e:
         logger.error(f"紐付けに失敗しました: {e}", exc_info=True)
         return None
 
     # 4. プレイリストに追加
-    playlist_title = utc_now.strftime(settings['youtube']['broadcast']['playlist_title_format'])
+    playlist_title = utc_now.strftime(broadcast_settings['playlist_title_format'])
     playlist_id = get_or_create_playlist(youtube, playlist_title, settings)
     if playlist_id:
         logger.info(f"4/4: 配信枠をプレイリスト '{playlist_title}' に追加中...")
-        try:
-            playlist_item_body = {
-                'snippet': {
-                    'playlistId': playlist_id,
-                    'resourceId': {
-                        'kind': 'youtube#video',
-                        'videoId': broadcast_id
-                    }
-                }
-            }
-            youtube.playlistItems().insert(
-                part='snippet',
-                body=playlist_item_body
-            ).execute()
-            logger.info("プレイリストへの追加に成功しました。")
-        except Exception as e:
-            logger.error(f"プレイリストへの追加に失敗しました: {e}", exc_info=True)
+        _get_playlist_insert_batcher(settings).enqueue(youtube, playlist_id, broadcast_id)
     else:
         logger.warning("プレイリストが見つからないか作成できなかったため、追加をスキップします。")
 
@@ -296,18 +785,75 @@ def create_youtube_broadcast(youtube, settings):
     return stream_name
 
 
+class BroadcastStatusPoller:
+    """
+    ライブ配信枠のステータスを、ETagを使った条件付きリクエスト (If-None-Match) で取得します。
+    前回から変化がない場合はYouTubeが本文なしの304を返すため、保持している前回のステータスを返します。
+    """
+    def __init__(self, youtube):
+        self.youtube = youtube
+        # 配信枠IDごとの (ETag, ステータス)
+        self._cache = {}
+
+    def get_status(self, broadcast_id):
+        """
+        指定されたライブ配信枠のステータス (lifeCycleStatus) を返します。見つからない場合はNoneを返します。
+        """
+        request = self.youtube.liveBroadcasts().list(
+            part='status',
+            fields='etag,items(status/lifeCycleStatus)',
+            id=broadcast_id
+        )
+        cached = self._cache.get(broadcast_id)
+        if cached is not None:
+            request.headers['If-None-Match'] = cached[0]
+        try:
+            response = request.execute(num_retries=NUM_RETRIES)
+        except HttpError as e:
+            if cached is not None and e.resp.status == 304:
+                return cached[1]
+            raise
+
+        items = response.get('items', [])
+        status = items[0]['status']['lifeCycleStatus'] if items else None
+        if response.get('etag'):
+            self._cache[broadcast_id] = (response['etag'], status)
+        return status
+
+_broadcast_status_poller = None
+
 def get_live_broadcast_status(youtube, broadcast_id):
     """
     指定されたライブ配信枠のステータスを取得します。
     """
+    global _broadcast_status_poller
     try:
-        response = youtube.liveBroadcasts().list(
-            part='status',
-            id=broadcast_id
-        ).execute()
-        if response and 'items' in response and len(response['items']) > 0:
-            return response['items'][0]['status']['lifeCycleStatus']
+        if _broadcast_status_poller is None or _broadcast_status_poller.youtube is not youtube:
+            _broadcast_status_poller = BroadcastStatusPoller(youtube)
+        return _broadcast_status_poller.get_status(broadcast_id)
+    except Exception as e:
+        logger.error(f"ライブ配信枠のステータス取得中にエラーが発生しました: {e}", exc_info=True)
         return None
+
+def get_live_broadcast_statuses(youtube, broadcast_ids):
+    """
+    複数のライブ配信枠のステータスを、50件ずつまとめて取得します。
+    {配信枠ID: ステータス} の辞書を返します。見つからなかった配信枠は含まれません。
+    取得に失敗した場合はNoneを返します。
+    """
+    broadcast_ids = list(broadcast_ids)
+    statuses = {}
+    try:
+        for start in range(0, len(broadcast_ids), 50):
+            response = youtube.liveBroadcasts().list(
+                part='status',
+                fields='items(id,status/lifeCycleStatus)',
+                id=','.join(broadcast_ids[start:start + 50]),
+                maxResults=50
+            ).execute(num_retries=NUM_RETRIES)
+            for item in response.get('items', []):
+                statuses[item['id']] = item['status']['lifeCycleStatus']
+        return statuses
     except Exception as e:
         logger.error(f"ライブ配信枠のステータス取得中にエラーが発生しました: {e}", exc_info=True)
         return None
@@ -321,7 +867,7 @@ def transition_broadcast_status(youtube, broadcast_id, status):
             part='status',
             id=broadcast_id,
             broadcastStatus=status
-        ).execute()
+        ).execute(num_retries=NUM_RETRIES)
         logger.info(f"ライブ配信枠 {broadcast_id} のステータスを {status} に遷移しました。")
         return True
     except Exception as e: